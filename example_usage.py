@@ -27,7 +27,7 @@ def example_usage():
         print(f"\n📁 ディレクトリ '{sample_pdf_dir}' のPDFファイルをインデックス化中...")
         results = search_manager.index_pdf_directory(sample_pdf_dir)
         
-        if results['success']:
+        if results['success_count']:
             print("✅ インデックス化完了!")
         else:
             print("⚠️  インデックス化するPDFファイルがありませんでした")
@@ -4,15 +4,418 @@ PDFファイルをOpenSearchにインデックス化し、検索する機能
 """
 
 import os
-import PyPDF2
-from typing import List, Dict, Any
+import json
+import bisect
+import time
+import importlib
+import importlib.util
+import multiprocessing
+from datetime import datetime
+from typing import List, Dict, Any, Iterator, Optional, Set, Tuple
 from opensearchpy import OpenSearch
 
+try:
+    import resource
+except ImportError:  # Windowsではメモリ制限を適用しない
+    resource = None
+
+
+# インデックス化ジョブのチェックポイント保存先
+DEFAULT_JOB_DIR = '.index_jobs'
+# 失敗ファイルとしてサマリーに残す最大件数
+MAX_FAILED_SAMPLES = 20
+# 再開に必要なチェックポイントの項目
+JOB_REQUIRED_KEYS = (
+    'job_id', 'directory', 'status', 'last_path', 'success_count',
+    'failed_count', 'total_files', 'elapsed_seconds', 'failed_samples'
+)
+# 抽出が停止・暴走したPDFファイルの記録先（ジョブ保存先の中に置く）
+QUARANTINE_FILENAME = 'quarantine.json'
+DEFAULT_QUARANTINE_PATH = os.path.join(DEFAULT_JOB_DIR, QUARANTINE_FILENAME)
+# 1ファイルあたりのテキスト抽出の制限
+DEFAULT_EXTRACT_TIMEOUT = 120
+DEFAULT_MEMORY_LIMIT_MB = 1024
+# 抽出ワーカーを作り直すまでに処理するファイル数
+WORKER_MAX_TASKS = 500
+
+
+def _extract_with_pymupdf(pdf_path: str) -> List[str]:
+    """PyMuPDFでページごとのテキストを抽出する"""
+    import fitz
+
+    with fitz.open(pdf_path) as doc:
+        return [page.get_text() for page in doc]
+
+
+def _extract_with_pypdfium2(pdf_path: str) -> List[str]:
+    """pypdfium2でページごとのテキストを抽出する"""
+    import pypdfium2
+
+    pdf = pypdfium2.PdfDocument(pdf_path)
+    try:
+        texts = []
+        for page in pdf:
+            textpage = page.get_textpage()
+            texts.append(textpage.get_text_range())
+            textpage.close()
+            page.close()
+        return texts
+    finally:
+        pdf.close()
+
+
+def _extract_with_pypdf(pdf_path: str) -> List[str]:
+    """pypdfでページごとのテキストを抽出する"""
+    import pypdf
+
+    reader = pypdf.PdfReader(pdf_path)
+    return [page.extract_text() or '' for page in reader.pages]
+
+
+def _extract_with_pypdf2(pdf_path: str) -> List[str]:
+    """PyPDF2でページごとのテキストを抽出する"""
+    import PyPDF2
+
+    with open(pdf_path, 'rb') as file:
+        pdf_reader = PyPDF2.PdfReader(file)
+        return [page.extract_text() or '' for page in pdf_reader.pages]
+
+
+# 抽出バックエンド: 名前 -> (モジュール名, 抽出関数)
+# autoの場合はインストール済みのものを上から順に選ぶ（高速な順）
+EXTRACTORS = {
+    'pymupdf': ('fitz', _extract_with_pymupdf),
+    'pypdfium2': ('pypdfium2', _extract_with_pypdfium2),
+    'pypdf': ('pypdf', _extract_with_pypdf),
+    'pypdf2': ('PyPDF2', _extract_with_pypdf2),
+}
+
+
+def available_extractors() -> List[str]:
+    """インストール済みの抽出バックエンド名を優先順に返す"""
+    return [name for name, (module_name, _) in EXTRACTORS.items()
+            if importlib.util.find_spec(module_name) is not None]
+
+
+def resolve_extractor(name: str = 'auto') -> str:
+    """抽出バックエンド名を解決する（autoなら最速の利用可能なもの）"""
+    available = available_extractors()
+    if name == 'auto':
+        if not available:
+            raise RuntimeError(
+                "PDF抽出ライブラリがインストールされていません: "
+                f"{', '.join(EXTRACTORS)}"
+            )
+        return available[0]
+
+    if name not in EXTRACTORS:
+        raise ValueError(f"不明な抽出バックエンドです: {name}")
+    if name not in available:
+        raise RuntimeError(f"抽出バックエンド '{name}' のライブラリが"
+                           f"インストールされていません")
+    return name
+
+
+class ExtractionAborted(Exception):
+    """タイムアウトやメモリ超過で抽出を打ち切ったことを表す"""
+
+
+class ExtractionWorkerError(RuntimeError):
+    """抽出ワーカーを起動できなかったことを表す（ファイルではなく環境の問題）"""
+
+
+def _extraction_worker(extractor: str, memory_limit_mb: Optional[int],
+                       conn, parent_conn):
+    """子プロセスでパイプから受け取ったPDFのテキストを順に抽出して返す"""
+    # 親側の端を閉じておかないと、親が閉じてもEOFが届かない
+    parent_conn.close()
+    if resource is not None and memory_limit_mb:
+        limit = memory_limit_mb * 1024 * 1024
+        try:
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+        except (ValueError, OSError):
+            pass
+
+    _, extract = EXTRACTORS[extractor]
+    while True:
+        try:
+            pdf_path = conn.recv()
+        except EOFError:
+            break
+
+        try:
+            conn.send(('ok', extract(pdf_path)))
+        except MemoryError:
+            # メモリ超過後の状態は信用できないため、このワーカーは終了する
+            conn.send(('memory', 'メモリ上限を超えました'))
+            break
+        except Exception as e:
+            conn.send(('error', str(e)))
+
+    conn.close()
+
+
+class ExtractionWorker:
+    """時間・メモリを制限してPDFのテキストを抽出する常駐ワーカープロセス
+
+    ファイルごとにforkするコストを避けるため同じ子プロセスを使い回し、
+    タイムアウト、メモリ超過、異常終了のときだけ作り直す。
+    抽出ライブラリのメモリリークに備え、max_tasks件ごとにも作り直す。
+    """
+
+    def __init__(self, extractor: str,
+                 timeout: Optional[float] = DEFAULT_EXTRACT_TIMEOUT,
+                 memory_limit_mb: Optional[int] = DEFAULT_MEMORY_LIMIT_MB,
+                 max_tasks: int = WORKER_MAX_TASKS):
+        self.extractor = extractor
+        self.timeout = timeout
+        self.memory_limit_mb = memory_limit_mb
+        self.max_tasks = max_tasks
+        self.process = None
+        self.conn = None
+        self.tasks = 0
+
+    def _start(self):
+        """ワーカープロセスを起動する"""
+        parent_conn, child_conn = multiprocessing.Pipe()
+        try:
+            process = multiprocessing.Process(
+                target=_extraction_worker,
+                args=(self.extractor, self.memory_limit_mb, child_conn,
+                      parent_conn),
+                daemon=True
+            )
+            process.start()
+        except BaseException as e:
+            # fork失敗時にパイプのfdを漏らさない
+            parent_conn.close()
+            child_conn.close()
+            if isinstance(e, OSError):
+                raise ExtractionWorkerError(f"抽出ワーカーを起動できません: {e}")
+            raise
+        child_conn.close()
+
+        self.process = process
+        self.conn = parent_conn
+        self.tasks = 0
+
+    def close(self):
+        """ワーカープロセスを停止する"""
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+        if self.process is not None:
+            self.process.join(timeout=1)
+            if self.process.is_alive():
+                self.process.kill()
+                self.process.join()
+            self.process = None
+
+    def _kill(self):
+        """応答しないワーカープロセスを強制終了する"""
+        if self.process is not None and self.process.is_alive():
+            self.process.kill()
+        self.close()
+
+    def extract(self, pdf_path: str) -> List[str]:
+        """ページごとのテキストを抽出する
+
+        タイムアウト、メモリ超過、ワーカーの異常終了時はExtractionAbortedを、
+        ワーカーを起動できない場合はExtractionWorkerErrorを、
+        抽出ライブラリのエラーはRuntimeErrorを送出する。
+        """
+        if (self.process is None or not self.process.is_alive()
+                or self.tasks >= self.max_tasks):
+            self.close()
+            self._start()
+
+        try:
+            self.tasks += 1
+            self.conn.send(pdf_path)
+            if not self.conn.poll(self.timeout):
+                raise ExtractionAborted(
+                    f"{self.timeout}秒以内に抽出が終わりませんでした"
+                )
+            try:
+                status, payload = self.conn.recv()
+            except EOFError:
+                self.process.join()
+                raise ExtractionAborted("抽出ワーカーが異常終了しました "
+                                        f"(終了コード: {self.process.exitcode})")
+        except BaseException:
+            self._kill()
+            raise
+
+        if status == 'memory':
+            self._kill()
+            raise ExtractionAborted(payload)
+        if status == 'error':
+            raise RuntimeError(payload)
+        return payload
+
+
+def _write_json_atomic(path: str, data: Any) -> None:
+    """JSONファイルを一時ファイル経由でアトミックに書き込む"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = path + '.tmp'
+
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def _path_key(relative_path: str) -> List[str]:
+    """走査順と一致する比較キー（パス要素のリスト）を返す"""
+    return relative_path.split(os.sep)
+
+
+def _list_pdf_entries(path: str) -> Tuple[List[str], Set[str]]:
+    """ディレクトリ内のPDFファイル名とサブディレクトリ名を名前順で返す
+
+    読み込めないディレクトリはOSErrorをそのまま送出する。
+    """
+    names = []
+    dirs = set()
+    with os.scandir(path) as it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                dirs.add(entry.name)
+                names.append(entry.name)
+            elif entry.name.lower().endswith('.pdf'):
+                names.append(entry.name)
+
+    names.sort()
+    return names, dirs
+
+
+def iter_pdf_files(directory_path: str,
+                   after: Optional[str] = None) -> Iterator[str]:
+    """ディレクトリ配下のPDFファイルをscandirで逐次列挙する
+
+    各ディレクトリ内のエントリを名前順に並べて深さ優先で走査するため、
+    列挙順は毎回同じになる。after（directory_pathからの相対パス）を
+    指定すると、そのファイル以前に列挙されるパスをスキップする。
+
+    並べ替えのため、走査中のディレクトリごとにPDFファイル名と
+    サブディレクトリ名のリストを保持する（メモリは1ディレクトリの
+    エントリ数に比例し、ツリー全体のファイル数には比例しない）。
+    読み込めないディレクトリがあるとOSErrorを送出する（読み飛ばさない）。
+    """
+    after_key = _path_key(after) if after else None
+    # 走査中の各階層: [パス, 名前順のエントリ名, ディレクトリ名, 次の位置]
+    stack = []
+
+    def push(path: str, depth: int, on_resume_path: bool):
+        names, dirs = _list_pdf_entries(path)
+
+        start = 0
+        if on_resume_path and after_key and depth < len(after_key):
+            # 再開位置までは二分探索で読み飛ばす
+            target = after_key[depth]
+            start = bisect.bisect_left(names, target)
+            if start < len(names) and names[start] == target:
+                if target not in dirs:
+                    start += 1
+                elif depth + 1 < len(after_key):
+                    stack.append([path, names, dirs, start + 1])
+                    push(os.path.join(path, target), depth + 1, True)
+                    return
+        stack.append([path, names, dirs, start])
+
+    push(directory_path, 0, True)
+
+    while stack:
+        frame = stack[-1]
+        path, names, dirs, index = frame
+        if index >= len(names):
+            stack.pop()
+            continue
+
+        frame[3] = index + 1
+        name = names[index]
+        entry_path = os.path.join(path, name)
+        if name in dirs:
+            push(entry_path, 0, False)
+        else:
+            yield entry_path
+
+
+def _check_checkpoint_interval(checkpoint_interval: int) -> None:
+    """チェックポイント間隔が1以上であることを確認する"""
+    if checkpoint_interval < 1:
+        raise ValueError("checkpoint_intervalは1以上を指定してください: "
+                         f"{checkpoint_interval}")
+
+
+def _job_file_path(job_dir: str, job_id: str) -> str:
+    """ジョブのチェックポイントファイルのパスを返す"""
+    return os.path.join(job_dir, f"{job_id}.json")
+
+
+def load_index_job(job_id: str,
+                   job_dir: str = DEFAULT_JOB_DIR) -> Optional[Dict[str, Any]]:
+    """保存済みのジョブ状態を読み込む
+
+    チェックポイントが壊れている場合はファイル名を含むRuntimeErrorを送出する。
+    """
+    job_path = _job_file_path(job_dir, job_id)
+    if not os.path.exists(job_path):
+        return None
+
+    try:
+        with open(job_path, 'r', encoding='utf-8') as f:
+            job = json.load(f)
+    except json.JSONDecodeError as e:
+        raise RuntimeError(f"チェックポイントが壊れています ({job_path}): {e}")
+
+    if not isinstance(job, dict):
+        raise RuntimeError(f"チェックポイントの形式が不正です ({job_path})")
+    missing = [key for key in JOB_REQUIRED_KEYS if key not in job]
+    if missing:
+        raise RuntimeError(f"チェックポイントに必要な項目がありません "
+                           f"({job_path}): {', '.join(missing)}")
+
+    job.setdefault('quarantined_count', 0)
+    return job
+
+
+def save_index_job(job: Dict[str, Any],
+                   job_dir: str = DEFAULT_JOB_DIR) -> None:
+    """ジョブ状態をアトミックに書き込む"""
+    _write_json_atomic(_job_file_path(job_dir, job['job_id']), job)
+
 
 class PDFSearchManager:
     def __init__(self, opensearch_host='opensearch-node1',
-                 opensearch_port=9200):
-        """OpenSearchクライアントを初期化"""
+                 opensearch_port=9200, extractor='auto',
+                 extract_timeout=DEFAULT_EXTRACT_TIMEOUT,
+                 memory_limit_mb=DEFAULT_MEMORY_LIMIT_MB,
+                 quarantine_path=None):
+        """OpenSearchクライアントとPDF抽出設定を初期化
+
+        quarantine_pathを省略すると、隔離リストはジョブの保存先
+        （index_pdf_directoryのjob_dir）の中に置かれる。
+        """
+        if extract_timeout is not None and extract_timeout <= 0:
+            raise ValueError("extract_timeoutは0より大きい値を指定してください: "
+                             f"{extract_timeout}")
+        if memory_limit_mb is not None and memory_limit_mb < 1:
+            raise ValueError("memory_limit_mbは1以上を指定してください: "
+                             f"{memory_limit_mb}")
+
+        self.extractor = extractor
+        self._resolved_extractor = None
+        self._worker = None
+        self.extract_timeout = extract_timeout
+        self.memory_limit_mb = memory_limit_mb
+        self._quarantine_path_option = quarantine_path
+        self.quarantine_path = quarantine_path or DEFAULT_QUARANTINE_PATH
+        self.quarantine = None
+
         self.client = OpenSearch(
             hosts=[{'host': opensearch_host, 'port': opensearch_port}],
             http_compress=True,
@@ -58,24 +461,108 @@ class PDFSearchManager:
             )
             print(f"✅ インデックス '{self.index_name}' を作成しました")
     
+    def get_extractor(self) -> str:
+        """使用する抽出バックエンドを初回利用時に解決する"""
+        if self._resolved_extractor is None:
+            name = resolve_extractor(self.extractor)
+            # fork時に子プロセスへ引き継がれるよう、先に読み込んでおく
+            importlib.import_module(EXTRACTORS[name][0])
+            self._resolved_extractor = name
+        return self._resolved_extractor
+
+    def close_extraction_worker(self):
+        """常駐している抽出ワーカーを停止する"""
+        if self._worker is not None:
+            self._worker.close()
+            self._worker = None
+
+    def _use_job_dir(self, job_dir: str):
+        """隔離リストの保存先をジョブの保存先に合わせる（明示指定時を除く）"""
+        if self._quarantine_path_option is not None:
+            return
+
+        quarantine_path = os.path.join(job_dir, QUARANTINE_FILENAME)
+        if quarantine_path != self.quarantine_path:
+            self.quarantine_path = quarantine_path
+            self.quarantine = None
+
+    def load_quarantine(self) -> Dict[str, Dict[str, Any]]:
+        """隔離済みPDFファイルの記録を初回利用時に読み込む"""
+        if self.quarantine is None:
+            if not os.path.exists(self.quarantine_path):
+                self.quarantine = {}
+                return self.quarantine
+
+            try:
+                with open(self.quarantine_path, 'r', encoding='utf-8') as f:
+                    self.quarantine = json.load(f)
+            except json.JSONDecodeError as e:
+                raise RuntimeError(
+                    f"隔離リストが壊れています ({self.quarantine_path}): {e}。"
+                    "ファイルを修正するか削除してください"
+                )
+        return self.quarantine
+
+    def _quarantine_key(self, pdf_path: str) -> Optional[Dict[str, Any]]:
+        """隔離判定に使うファイルのサイズと更新日時を返す"""
+        try:
+            stat = os.stat(pdf_path)
+        except OSError:
+            return None
+        return {'size': stat.st_size, 'mtime': stat.st_mtime}
+
+    def is_quarantined(self, pdf_path: str) -> bool:
+        """PDFファイルが隔離済み（かつ隔離後に変更されていない）か判定する"""
+        entry = self.load_quarantine().get(os.path.abspath(pdf_path))
+        if entry is None:
+            return False
+
+        key = self._quarantine_key(pdf_path)
+        return (key is not None and entry['size'] == key['size']
+                and entry['mtime'] == key['mtime'])
+
+    def quarantine_pdf(self, pdf_path: str, reason: str):
+        """抽出できなかったPDFファイルを隔離リストに記録する"""
+        key = self._quarantine_key(pdf_path) or {'size': None, 'mtime': None}
+        self.load_quarantine()[os.path.abspath(pdf_path)] = {
+            **key,
+            'extractor': self._resolved_extractor,
+            'reason': reason,
+            'quarantined_at': datetime.now().isoformat()
+        }
+        _write_json_atomic(self.quarantine_path, self.quarantine)
+        print(f"🚫 PDFファイルを隔離しました ({pdf_path}): {reason}")
+
     def extract_text_from_pdf(self, pdf_path: str) -> List[Dict[str, Any]]:
-        """PDFファイルからテキストを抽出し、ページごとに分割する"""
+        """PDFファイルからテキストを抽出し、ページごとに分割する
+
+        抽出バックエンドを解決できない場合やワーカーを起動できない場合は
+        ファイルごとのエラーとせず、例外をそのまま送出する。
+        """
         pages_content = []
+        if self._worker is None:
+            self._worker = ExtractionWorker(
+                self.get_extractor(),
+                timeout=self.extract_timeout,
+                memory_limit_mb=self.memory_limit_mb
+            )
         
         try:
-            with open(pdf_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                
-                for page_num, page in enumerate(pdf_reader.pages, 1):
-                    text = page.extract_text()
-                    if text.strip():  # 空でないページのみ
-                        pages_content.append({
-                            'filename': os.path.basename(pdf_path),
-                            'file_path': pdf_path,
-                            'content': text,
-                            'page_number': page_num
-                        })
+            texts = self._worker.extract(pdf_path)
+            
+            for page_num, text in enumerate(texts, 1):
+                if text.strip():  # 空でないページのみ
+                    pages_content.append({
+                        'filename': os.path.basename(pdf_path),
+                        'file_path': pdf_path,
+                        'content': text,
+                        'page_number': page_num
+                    })
                 
+        except ExtractionAborted as e:
+            self.quarantine_pdf(pdf_path, str(e))
+        except ExtractionWorkerError:
+            raise
         except Exception as e:
             print(f"❌ PDFファイル読み込みエラー ({pdf_path}): {e}")
             
@@ -87,6 +574,14 @@ class PDFSearchManager:
             print(f"❌ ファイルが見つかりません: {pdf_path}")
             return False
         
+        if self.is_quarantined(pdf_path):
+            print(f"⏭️  隔離済みのためスキップします: {pdf_path}")
+            return False
+        
+        return self._index_pdf_file(pdf_path)
+    
+    def _index_pdf_file(self, pdf_path: str) -> bool:
+        """存在と隔離の確認済みのPDFファイルを抽出してインデックス化する"""
         # PDFからテキスト抽出
         pages_content = self.extract_text_from_pdf(pdf_path)
         
@@ -118,40 +613,177 @@ class PDFSearchManager:
         print(f"✅ PDF '{filename}' を {page_count} ページインデックス化しました")
         return True
     
-    def index_pdf_directory(self, directory_path: str) -> Dict[str, Any]:
-        """ディレクトリ内の全PDFファイルをインデックス化する"""
-        results = {
-            'success': [],
-            'failed': [],
-            'total_files': 0
-        }
-        
-        if not os.path.exists(directory_path):
+    def index_pdf_directory(self, directory_path: str,
+                            job_id: Optional[str] = None,
+                            job_dir: str = DEFAULT_JOB_DIR,
+                            checkpoint_interval: int = 100
+                            ) -> Dict[str, Any]:
+        """ディレクトリ内の全PDFファイルをジョブとしてインデックス化する
+
+        処理状況はcheckpoint_interval件ごとにjob_dirへ保存され、
+        中断した場合はresume_index_jobで続きから再開できる。
+        同じjob_idの未完了ジョブがある場合は上書きせずに失敗を返す。
+        隔離リストもquarantine_pathの指定がなければjob_dirに保存される。
+        """
+        _check_checkpoint_interval(checkpoint_interval)
+        # 設定ミスでジョブ全体が失敗しないよう、開始前に解決しておく
+        self.get_extractor()
+        self._use_job_dir(job_dir)
+        self.load_quarantine()
+
+        if not os.path.isdir(directory_path):
             print(f"❌ ディレクトリが見つかりません: {directory_path}")
-            return results
-        
-        # PDFファイルを検索
-        pdf_files = []
-        for root, dirs, files in os.walk(directory_path):
-            for file in files:
-                if file.lower().endswith('.pdf'):
-                    pdf_files.append(os.path.join(root, file))
-        
-        results['total_files'] = len(pdf_files)
-        
-        # 各PDFファイルをインデックス化
-        for pdf_path in pdf_files:
-            if self.index_pdf(pdf_path):
-                results['success'].append(pdf_path)
-            else:
-                results['failed'].append(pdf_path)
-        
+            return self._failed_job_result(job_id)
+
+        if job_id is None:
+            job_id = datetime.now().strftime('%Y%m%d-%H%M%S')
+
+        # 未完了のチェックポイントを上書きして最初からやり直さないようにする
+        existing = load_index_job(job_id, job_dir)
+        if existing is not None and existing['status'] != 'completed':
+            print(f"❌ ジョブ '{job_id}' は未完了です。"
+                  f"続きから再開するには --resume {job_id} を指定してください")
+            return self._failed_job_result(job_id)
+
+        now = datetime.now().isoformat()
+        job = {
+            'job_id': job_id,
+            'directory': os.path.abspath(directory_path),
+            'status': 'running',
+            'started_at': now,
+            'updated_at': now,
+            'last_path': None,
+            'success_count': 0,
+            'failed_count': 0,
+            'quarantined_count': 0,
+            'total_files': 0,
+            'elapsed_seconds': 0.0,
+            'failed_samples': []
+        }
+        save_index_job(job, job_dir)
+        print(f"🚀 インデックス化ジョブ '{job_id}' を開始します")
+
+        return self._run_index_job(job, job_dir, checkpoint_interval)
+
+    def _failed_job_result(self, job_id: Optional[str]) -> Dict[str, Any]:
+        """開始できなかったジョブの結果を返す"""
+        return {
+            'job_id': job_id,
+            'status': 'failed',
+            'success_count': 0,
+            'failed_count': 0,
+            'quarantined_count': 0,
+            'total_files': 0,
+            'failed_samples': []
+        }
+
+    def resume_index_job(self, job_id: str,
+                         job_dir: str = DEFAULT_JOB_DIR,
+                         checkpoint_interval: int = 100
+                         ) -> Optional[Dict[str, Any]]:
+        """中断したインデックス化ジョブを最後のチェックポイントから再開する"""
+        _check_checkpoint_interval(checkpoint_interval)
+        self.get_extractor()
+        self._use_job_dir(job_dir)
+        self.load_quarantine()
+
+        job = load_index_job(job_id, job_dir)
+        if job is None:
+            print(f"❌ ジョブが見つかりません: {job_id}")
+            return None
+
+        if job['status'] == 'completed':
+            print(f"✅ ジョブ '{job_id}' は既に完了しています")
+            return job
+
+        if not os.path.isdir(job['directory']):
+            print(f"❌ ディレクトリが見つかりません: {job['directory']}")
+            return self._failed_job_result(job_id)
+
+        print(f"🔄 ジョブ '{job_id}' を再開します "
+              f"(処理済み: {job['total_files']} ファイル)")
+        job['status'] = 'running'
+
+        return self._run_index_job(job, job_dir, checkpoint_interval)
+
+    def _run_index_job(self, job: Dict[str, Any], job_dir: str,
+                       checkpoint_interval: int) -> Dict[str, Any]:
+        """ジョブ状態に従ってPDFファイルを順にインデックス化する"""
+        directory_path = job['directory']
+        started = time.monotonic()
+        elapsed_before = job['elapsed_seconds']
+        processed_in_run = 0
+
+        try:
+            for pdf_path in iter_pdf_files(directory_path,
+                                           after=job['last_path']):
+                # 列挙直後のためindex_pdfの存在確認は省き、隔離判定も1回にする
+                if self.is_quarantined(pdf_path):
+                    # 既知の隔離ファイルは新しい失敗と区別して数える
+                    job['quarantined_count'] += 1
+                elif self._index_pdf_file(pdf_path):
+                    job['success_count'] += 1
+                else:
+                    job['failed_count'] += 1
+                    if len(job['failed_samples']) < MAX_FAILED_SAMPLES:
+                        job['failed_samples'].append(pdf_path)
+
+                job['total_files'] += 1
+                job['last_path'] = os.path.relpath(pdf_path, directory_path)
+                processed_in_run += 1
+
+                if processed_in_run % checkpoint_interval == 0:
+                    elapsed = time.monotonic() - started
+                    job['elapsed_seconds'] = elapsed_before + elapsed
+                    job['updated_at'] = datetime.now().isoformat()
+                    save_index_job(job, job_dir)
+                    self._print_job_progress(job, processed_in_run, elapsed)
+
+            job['status'] = 'completed'
+        except KeyboardInterrupt:
+            job['status'] = 'interrupted'
+            print(f"\n⏸️  中断しました。再開するには --resume {job['job_id']} "
+                  f"を指定してください")
+        except ExtractionWorkerError as e:
+            job['status'] = 'interrupted'
+            print(f"\n❌ {e}")
+            print(f"   原因を解消してから --resume {job['job_id']} で"
+                  f"再開してください")
+        except OSError as e:
+            # 読めないサブツリーを飛ばして完了扱いにしないよう、ここで止める
+            job['status'] = 'interrupted'
+            print(f"\n❌ ディレクトリ読み込みエラー: {e}")
+            print(f"   原因を解消してから --resume {job['job_id']} で"
+                  f"再開してください")
+        finally:
+            self.close_extraction_worker()
+            job['elapsed_seconds'] = (elapsed_before
+                                      + time.monotonic() - started)
+            job['updated_at'] = datetime.now().isoformat()
+            save_index_job(job, job_dir)
+
         print("\n📊 インデックス化結果:")
-        print(f"   成功: {len(results['success'])} ファイル")
-        print(f"   失敗: {len(results['failed'])} ファイル")
-        print(f"   合計: {results['total_files']} ファイル")
-        
-        return results
+        print(f"   ジョブID: {job['job_id']}")
+        print(f"   成功: {job['success_count']} ファイル")
+        print(f"   失敗: {job['failed_count']} ファイル")
+        print(f"   隔離済みでスキップ: {job['quarantined_count']} ファイル")
+        print(f"   合計: {job['total_files']} ファイル")
+        print(f"   処理時間: {job['elapsed_seconds']:.1f} 秒")
+        if job['failed_samples']:
+            print("   失敗したファイル (先頭のみ):")
+            for path in job['failed_samples']:
+                print(f"     • {path}")
+
+        return job
+
+    def _print_job_progress(self, job: Dict[str, Any],
+                            processed_in_run: int, elapsed: float):
+        """ジョブの進捗とスループットを表示する"""
+        throughput = processed_in_run / elapsed if elapsed > 0 else 0.0
+        print(f"⏳ 処理済み: {job['total_files']} ファイル "
+              f"(成功 {job['success_count']} / 失敗 {job['failed_count']} "
+              f"/ 隔離 {job['quarantined_count']}) "
+              f"- {throughput:.1f} ファイル/秒")
     
     def search_text(self, query: str, size: int = 10) -> List[Dict[str, Any]]:
         """テキスト検索を実行する"""
@@ -4,8 +4,38 @@ PDFファイル検索のコマンドラインツール
 """
 
 import argparse
+import os
 import sys
-from pdf_search import PDFSearchManager
+from pdf_search import (
+    PDFSearchManager,
+    EXTRACTORS,
+    DEFAULT_JOB_DIR,
+    DEFAULT_EXTRACT_TIMEOUT,
+    DEFAULT_MEMORY_LIMIT_MB,
+    QUARANTINE_FILENAME,
+)
+
+
+def positive_int(value):
+    """1以上の整数を受け付けるargparse用の型"""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"整数を指定してください: {value}")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"1以上の整数を指定してください: {value}")
+    return number
+
+
+def positive_float(value):
+    """0より大きい数値を受け付けるargparse用の型"""
+    try:
+        number = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"数値を指定してください: {value}")
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"0より大きい値を指定してください: {value}")
+    return number
 
 
 def main():
@@ -22,8 +52,49 @@ def main():
     )
     index_parser.add_argument(
         'path', 
+        nargs='?',
         help='PDFファイルまたはディレクトリのパス'
     )
+    index_parser.add_argument(
+        '--resume',
+        metavar='JOB_ID',
+        help='中断したインデックス化ジョブを再開'
+    )
+    index_parser.add_argument(
+        '--job-id',
+        help='ディレクトリのインデックス化ジョブID (デフォルト: 開始日時)'
+    )
+    index_parser.add_argument(
+        '--job-dir',
+        default=DEFAULT_JOB_DIR,
+        help=f'ジョブのチェックポイント保存先 (デフォルト: {DEFAULT_JOB_DIR})'
+    )
+    index_parser.add_argument(
+        '--checkpoint-interval',
+        type=positive_int,
+        default=100,
+        help='チェックポイントを保存する間隔のファイル数 (デフォルト: 100)'
+    )
+    index_parser.add_argument(
+        '--extractor',
+        choices=['auto', *EXTRACTORS],
+        default='auto',
+        help='PDFテキスト抽出バックエンド (デフォルト: auto)'
+    )
+    index_parser.add_argument(
+        '--timeout',
+        type=positive_float,
+        default=DEFAULT_EXTRACT_TIMEOUT,
+        help=f'1ファイルあたりの抽出タイムアウト秒数 '
+             f'(デフォルト: {DEFAULT_EXTRACT_TIMEOUT})'
+    )
+    index_parser.add_argument(
+        '--memory-limit',
+        type=positive_int,
+        default=DEFAULT_MEMORY_LIMIT_MB,
+        help=f'抽出ワーカーのメモリ上限MB '
+             f'(デフォルト: {DEFAULT_MEMORY_LIMIT_MB})'
+    )
     
     # 検索コマンド
     search_parser = subparsers.add_parser(
@@ -53,27 +124,78 @@ def main():
         parser.print_help()
         return
     
+    if args.command == 'index':
+        if not args.path and not args.resume:
+            index_parser.error('path または --resume を指定してください')
+        if args.resume and (args.path or args.job_id):
+            index_parser.error('--resume は path や --job-id と同時に指定できません')
+    
     # PDFSearchManagerを初期化
+    manager_options = {}
+    if args.command == 'index':
+        manager_options = {
+            'extractor': args.extractor,
+            'extract_timeout': args.timeout,
+            'memory_limit_mb': args.memory_limit,
+            'quarantine_path': os.path.join(args.job_dir, QUARANTINE_FILENAME),
+        }
+    
     try:
-        search_manager = PDFSearchManager()
+        search_manager = PDFSearchManager(**manager_options)
     except Exception as e:
         print(f"❌ OpenSearchへの接続エラー: {e}")
         sys.exit(1)
     
     # コマンドに応じて処理を実行
     if args.command == 'index':
-        import os
-        if os.path.isfile(args.path):
+        # 設定ミスはファイルごとではなく開始時に検出する
+        try:
+            extractor = search_manager.get_extractor()
+            search_manager.load_quarantine()
+        except (RuntimeError, ValueError) as e:
+            print(f"❌ インデックス化を開始できません: {e}")
+            sys.exit(1)
+        print(f"📄 抽出バックエンド: {extractor}")
+        
+        if args.resume:
+            # 中断したジョブの再開
+            try:
+                results = search_manager.resume_index_job(
+                    args.resume,
+                    job_dir=args.job_dir,
+                    checkpoint_interval=args.checkpoint_interval
+                )
+            except RuntimeError as e:
+                print(f"❌ ジョブを再開できません: {e}")
+                sys.exit(1)
+            if (not results or results['status'] != 'completed'
+                    or results['failed_count']):
+                sys.exit(1)
+        elif os.path.isfile(args.path):
             # 単一ファイルのインデックス化
-            if search_manager.index_pdf(args.path):
+            try:
+                indexed = search_manager.index_pdf(args.path)
+            except RuntimeError as e:
+                print(f"❌ {e}")
+                sys.exit(1)
+            if indexed:
                 print("✅ インデックス化が完了しました")
             else:
                 print("❌ インデックス化に失敗しました")
                 sys.exit(1)
         elif os.path.isdir(args.path):
             # ディレクトリ全体のインデックス化
-            results = search_manager.index_pdf_directory(args.path)
-            if results['failed']:
+            try:
+                results = search_manager.index_pdf_directory(
+                    args.path,
+                    job_id=args.job_id,
+                    job_dir=args.job_dir,
+                    checkpoint_interval=args.checkpoint_interval
+                )
+            except RuntimeError as e:
+                print(f"❌ ジョブを開始できません: {e}")
+                sys.exit(1)
+            if results['status'] != 'completed' or results['failed_count']:
                 sys.exit(1)
         else:
             print(f"❌ パスが見つかりません: {args.path}")